@@ -35,6 +35,7 @@ interface GeneratedPaper {
   created_at: string;
   updated_at: string;
   size: number;
+  upload_status: 'uploaded' | 'uploading' | 'failed';
 }
 
 export default function PredictionsPage() {
@@ -72,15 +73,22 @@ export default function PredictionsPage() {
     }
   };
 
-  const loadPapers = async () => {
+  // New papers upload after the server responds - refresh until they land
+  useEffect(() => {
+    if (!papers.some((paper) => paper.upload_status === 'uploading')) return;
+    const timer = setTimeout(() => loadPapers(true), 3000);
+    return () => clearTimeout(timer);
+  }, [papers]);
+
+  const loadPapers = async (quiet = false) => {
     try {
-      setLoadingPapers(true);
+      if (!quiet) setLoadingPapers(true);
       const data = await getPapers();
       setPapers(data.papers);
     } catch (err: any) {
       console.error('Error loading papers:', err);
     } finally {
-      setLoadingPapers(false);
+      if (!quiet) setLoadingPapers(false);
     }
   };
 
@@ -496,7 +504,13 @@ export default function PredictionsPage() {
                   </div>
                   <div className="flex items-center space-x-2 text-gray-600">
                     <FileText className="w-4 h-4" />
-                    <span>{formatFileSize(paper.size)}</span>
+                    <span>
+                      {paper.upload_status === 'uploading'
+                        ? 'Uploading…'
+                        : paper.upload_status === 'failed'
+                          ? 'Upload failed'
+                          : formatFileSize(paper.size)}
+                    </span>
                   </div>
                   <div className="flex items-center space-x-2 text-gray-600">
                     <BookOpen className="w-4 h-4" />
@@ -513,9 +527,14 @@ export default function PredictionsPage() {
                   <Button 
                     className="w-full bg-blue-400 hover:bg-blue-500"
                     onClick={() => downloadPaper(paper)}
+                    disabled={paper.upload_status !== 'uploaded'}
                   >
                     <Download className="w-4 h-4 mr-2" />
-                    Download Paper
+                    {paper.upload_status === 'uploading'
+                      ? 'Uploading…'
+                      : paper.upload_status === 'failed'
+                        ? 'Upload Failed - Generate Again'
+                        : 'Download Paper'}
                   </Button>
                 </div>
               </CardContent>
@@ -0,0 +1,75 @@
+# benchmarks/bench_paper_pdf.py
+# Measures exam paper PDF rendering throughput (pages/sec) for 20 and 60 mark papers.
+#
+# Usage: python benchmarks/bench_paper_pdf.py [--runs 20] [--workers 4]
+import argparse
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from paper_pdf import build_paper_pdf, init_render_worker, pool_context
+
+# Paper structures matching the /generate_paper prompt
+STRUCTURES = {
+    20: [("Section A - Multiple Choice Questions", "mcq", 5, 1),
+         ("Section B - Short Answer Questions", "short", 3, 5)],
+    60: [("Section A - Multiple Choice Questions", "mcq", 10, 1),
+         ("Section B - Short Answer Questions", "short", 5, 4),
+         ("Section C - Long Answer Questions", "long", 3, 10)],
+}
+
+def sample_paper(marks: int) -> str:
+    """Build synthetic LLM-style paper text for the given marks"""
+    lines = []
+    for header, kind, count, per_question in STRUCTURES[marks]:
+        lines.append(header)
+        for i in range(1, count + 1):
+            if kind == "mcq":
+                lines.append(f"Q{i}. Which of the following best describes concept {i} from the syllabus?")
+                for option in "ABCD":
+                    lines.append(f"    {option}) A plausible description of option {option} for concept {i}")
+            else:
+                lines.append(f"Q{i}. Explain concept {i} with a suitable example and discuss its limitations. [{per_question} marks]")
+                for _ in range(4 if kind == "short" else 12):
+                    lines.append("    _______________________________________")
+            lines.append("")
+    return "\n".join(lines)
+
+def render(marks: int):
+    _, pages = build_paper_pdf(sample_paper(marks), "Benchmark", marks, "2024-01-01 00:00:00")
+    return pages
+
+def bench_inline(marks: int, runs: int):
+    init_render_worker()
+    start = time.perf_counter()
+    pages = sum(render(marks) for _ in range(runs))
+    return pages, time.perf_counter() - start
+
+def bench_pool(marks: int, runs: int, workers: int):
+    # Same start method as the server's render pool
+    with ProcessPoolExecutor(max_workers=workers, mp_context=pool_context(), initializer=init_render_worker) as pool:
+        # Warm up every worker before timing
+        list(pool.map(render, [marks] * workers))
+        start = time.perf_counter()
+        pages = sum(pool.map(render, [marks] * runs))
+        return pages, time.perf_counter() - start
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark exam paper PDF rendering")
+    parser.add_argument("--runs", type=int, default=20, help="papers rendered per configuration")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 2, help="render pool size")
+    args = parser.parse_args()
+
+    print(f"{'marks':>5}  {'mode':<10} {'papers':>6} {'pages':>6} {'secs':>8} {'pages/sec':>10}")
+    for marks in (20, 60):
+        for mode, (pages, elapsed) in (
+            ("inline", bench_inline(marks, args.runs)),
+            (f"pool x{args.workers}", bench_pool(marks, args.runs, args.workers)),
+        ):
+            print(f"{marks:>5}  {mode:<10} {args.runs:>6} {pages:>6} {elapsed:>8.3f} {pages / elapsed:>10.1f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+# benchmarks/bench_retrieval.py
+# Compares chat retrieval setups on an indexed folder: the original dense top-10 vs hybrid BM25 + dense.
+# Reports retrieval latency, prompt tokens per query and answer-quality deltas.
+#
+# Usage: python benchmarks/bench_retrieval.py data/indexes/<user_id>/<folder>_faiss queries.jsonl [--answer]
+#
+# queries.jsonl - one {"query": "...", "expected": ["key", "terms"] or "reference answer"} per line.
+# Quality = share of expected terms found in the retrieved context (and, with --answer, in the
+# LLM's answer - needs GROQ_API_KEY).
+import argparse
+import json
+import os
+import statistics
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import hybrid_search
+
+MODES = ("dense", "hybrid")
+
+def expected_terms(expected) -> set:
+    if isinstance(expected, list):
+        return {term.lower() for term in expected}
+    # Reference answer: use its content words
+    return {token for token in hybrid_search.tokenize(expected or "") if len(token) > 3}
+
+def term_recall(terms: set, text: str) -> float:
+    if not terms:
+        return 0.0
+    lowered = text.lower()
+    return sum(1 for term in terms if term in lowered) / len(terms)
+
+def percentile(values, pct):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))]
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark dense vs hybrid chat retrieval")
+    parser.add_argument("index_path", help="FAISS index directory ({folder}_faiss)")
+    parser.add_argument("queries", help="JSONL file of queries")
+    parser.add_argument("--answer", action="store_true", help="also generate answers with the chat LLM")
+    args = parser.parse_args()
+
+    from dotenv import load_dotenv
+    from langchain_huggingface import HuggingFaceEmbeddings
+    from langchain_community.vectorstores import FAISS
+    load_dotenv()
+
+    embeddings = HuggingFaceEmbeddings(model_name="sentence-transformers/all-MiniLM-L6-v2")
+    vectorstore = FAISS.load_local(args.index_path, embeddings, allow_dangerous_deserialization=True)
+    hybrid_search.load_or_build_bm25_index(vectorstore, args.index_path)
+
+    llm = None
+    if args.answer:
+        from langchain_groq import ChatGroq
+        llm = ChatGroq(model="openai/gpt-oss-20b", temperature=0, reasoning_format="parsed", max_retries=2)
+
+    with open(args.queries, "r", encoding="utf-8") as f:
+        queries = [json.loads(line) for line in f if line.strip()]
+
+    results = {mode: {"latency": [], "tokens": [], "context_recall": [], "answer_recall": []} for mode in MODES}
+    embeddings.embed_query("warm-up")
+
+    for item in queries:
+        terms = expected_terms(item.get("expected"))
+        for mode in MODES:
+            docs, stats = hybrid_search.retrieve_chunks(vectorstore, embeddings, item["query"], args.index_path, mode=mode)
+            context = "\n\n".join(doc.page_content for doc in docs)
+            # Context + question only - the fixed instruction text is identical for both modes
+            prompt = f"Context from documents:\n{context}\n\nStudent's Question: {item['query']}\n\nAnswer:"
+
+            result = results[mode]
+            result["latency"].append(stats["retrieval_ms"])
+            result["tokens"].append(hybrid_search.estimate_tokens(prompt))
+            result["context_recall"].append(term_recall(terms, context))
+            if llm is not None:
+                result["answer_recall"].append(term_recall(terms, llm.invoke(prompt).content))
+
+    print(f"{len(queries)} queries against {args.index_path}\n")
+    print(f"{'mode':<8} {'p50 ms':>8} {'p95 ms':>8} {'tokens/query':>13} {'context recall':>15} {'answer recall':>14}")
+    summary = {}
+    for mode in MODES:
+        result = results[mode]
+        summary[mode] = {
+            "tokens": statistics.mean(result["tokens"]),
+            "context_recall": statistics.mean(result["context_recall"]),
+            "answer_recall": statistics.mean(result["answer_recall"]) if result["answer_recall"] else None,
+        }
+        answer = f"{summary[mode]['answer_recall']:.3f}" if summary[mode]["answer_recall"] is not None else "-"
+        print(f"{mode:<8} {percentile(result['latency'], 50):>8.1f} {percentile(result['latency'], 95):>8.1f} "
+              f"{summary[mode]['tokens']:>13.0f} {summary[mode]['context_recall']:>15.3f} {answer:>14}")
+
+    dense, hybrid = summary["dense"], summary["hybrid"]
+    print(f"\nhybrid vs dense: prompt tokens {hybrid['tokens'] / dense['tokens'] - 1:+.1%}, "
+          f"context recall {hybrid['context_recall'] - dense['context_recall']:+.3f}", end="")
+    if hybrid["answer_recall"] is not None:
+        print(f", answer recall {hybrid['answer_recall'] - dense['answer_recall']:+.3f}")
+    else:
+        print()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,198 @@
+# hybrid_search.py
+# Hybrid lexical + dense retrieval for chat.
+# index_folder stores a precomputed BM25 inverted index next to each FAISS index; at
+# query time BM25 and FAISS rankings are fused (reciprocal rank fusion) and a small,
+# high-precision set of chunks is selected under a chunk count / character budget.
+import gzip
+import json
+import math
+import os
+import re
+import tempfile
+import threading
+import time
+from collections import Counter, OrderedDict, defaultdict
+from typing import List, Optional, Tuple
+
+# BM25 file stored inside the folder's FAISS index directory
+BM25_FILENAME = "bm25.json.gz"
+
+# Chat retrieval settings
+# CHAT_RETRIEVAL: "hybrid" (BM25 + dense) or "dense" (the original top-10 similarity search)
+RETRIEVAL_MODES = ("hybrid", "dense")
+CHAT_RETRIEVAL = os.getenv("CHAT_RETRIEVAL", "hybrid").lower()
+if CHAT_RETRIEVAL not in RETRIEVAL_MODES:
+    raise ValueError(f"CHAT_RETRIEVAL must be one of {', '.join(RETRIEVAL_MODES)}, got '{CHAT_RETRIEVAL}'")
+HYBRID_TOP_K = int(os.getenv("HYBRID_TOP_K", "6"))                 # max chunks sent to the LLM
+HYBRID_CONTEXT_CHARS = int(os.getenv("HYBRID_CONTEXT_CHARS", "6000"))  # context size budget
+HYBRID_BUDGET_MS = float(os.getenv("HYBRID_BUDGET_MS", "50"))       # lexical scoring time budget
+HYBRID_CANDIDATES = int(os.getenv("HYBRID_CANDIDATES", "20"))       # candidates per ranker
+DENSE_TOP_K = 10                                                   # original dense-only setup
+BM25_CACHE_SIZE = int(os.getenv("BM25_CACHE_SIZE", "32"))          # folders' indexes kept in memory
+
+# Keeps section numbers, decimals and identifiers together: "3.2.1", "x_i", "k-means"
+TOKEN_PATTERN = re.compile(r"\w+(?:[.\-]\w+)*")
+
+# LRU of loaded BM25 indexes: file path -> (mtime, index), at most BM25_CACHE_SIZE entries
+_index_cache: "OrderedDict[str, Tuple[float, dict]]" = OrderedDict()
+_index_cache_lock = threading.Lock()
+
+def tokenize(text: str) -> List[str]:
+    return TOKEN_PATTERN.findall(text.lower())
+
+def estimate_tokens(text: str) -> int:
+    """Rough LLM token count (~4 characters per token)"""
+    return len(text) // 4
+
+# ----------------- BM25 Inverted Index -----------------
+def build_bm25_index(texts: List[str], k1: float = 1.5, b: float = 0.75) -> dict:
+    """
+    Build a BM25 inverted index over chunk texts (doc id = position = FAISS row).
+    Postings store the final per-document BM25 weight, so a query is just a sum.
+    """
+    doc_terms = [Counter(tokenize(text)) for text in texts]
+    doc_lens = [sum(terms.values()) for terms in doc_terms]
+    num_docs = len(texts)
+    avgdl = (sum(doc_lens) / num_docs) if num_docs else 0.0
+
+    postings = defaultdict(lambda: ([], []))
+    for doc_id, terms in enumerate(doc_terms):
+        norm = k1 * (1 - b + b * doc_lens[doc_id] / avgdl) if avgdl else k1
+        for term, tf in terms.items():
+            ids, weights = postings[term]
+            ids.append(doc_id)
+            weights.append(tf * (k1 + 1) / (tf + norm))
+
+    index = {}
+    for term, (ids, weights) in postings.items():
+        df = len(ids)
+        idf = math.log(1 + (num_docs - df + 0.5) / (df + 0.5))
+        index[term] = [idf, ids, [round(idf * w, 4) for w in weights]]
+
+    return {"num_docs": num_docs, "k1": k1, "b": b, "postings": index}
+
+def save_bm25_index(index: dict, index_path: str):
+    """Write the BM25 index into a FAISS index directory"""
+    os.makedirs(index_path, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=index_path, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as raw, gzip.open(raw, "wt", encoding="utf-8") as f:
+            json.dump(index, f, separators=(",", ":"))
+        os.replace(tmp_path, os.path.join(index_path, BM25_FILENAME))
+    except Exception:
+        os.unlink(tmp_path)
+        raise
+
+def load_bm25_index(index_path: str) -> Optional[dict]:
+    """Load a folder's BM25 index (LRU-cached in memory until the file changes)"""
+    file_path = os.path.join(index_path, BM25_FILENAME)
+    try:
+        mtime = os.path.getmtime(file_path)
+    except OSError:
+        return None
+
+    with _index_cache_lock:
+        cached = _index_cache.get(file_path)
+        if cached and cached[0] == mtime:
+            _index_cache.move_to_end(file_path)
+            return cached[1]
+
+    with gzip.open(file_path, "rt", encoding="utf-8") as f:
+        index = json.load(f)
+
+    with _index_cache_lock:
+        _index_cache[file_path] = (mtime, index)
+        _index_cache.move_to_end(file_path)
+        while len(_index_cache) > BM25_CACHE_SIZE:
+            _index_cache.popitem(last=False)
+    return index
+
+def texts_from_vectorstore(vectorstore) -> List[str]:
+    """Chunk texts in FAISS row order"""
+    id_map = vectorstore.index_to_docstore_id
+    return [vectorstore.docstore.search(id_map[i]).page_content for i in range(len(id_map))]
+
+def load_or_build_bm25_index(vectorstore, index_path: str) -> dict:
+    """Load the BM25 index, building it from the FAISS docstore for folders indexed before BM25"""
+    index = load_bm25_index(index_path)
+    if index is None or index["num_docs"] != len(vectorstore.index_to_docstore_id):
+        save_bm25_index(build_bm25_index(texts_from_vectorstore(vectorstore)), index_path)
+        index = load_bm25_index(index_path)
+    return index
+
+def bm25_search(index: dict, query: str, k: int, deadline: Optional[float] = None) -> List[Tuple[int, float]]:
+    """
+    Score documents for the query. Rarest (most informative) terms are scored first;
+    if `deadline` (perf_counter time) passes, the remaining common terms are skipped.
+    """
+    postings = index["postings"]
+    terms = sorted({t for t in tokenize(query) if t in postings}, key=lambda t: postings[t][0], reverse=True)
+
+    scores = defaultdict(float)
+    for term in terms:
+        if deadline is not None and scores and time.perf_counter() > deadline:
+            break
+        _, ids, weights = postings[term]
+        for doc_id, weight in zip(ids, weights):
+            scores[doc_id] += weight
+
+    return sorted(scores.items(), key=lambda item: item[1], reverse=True)[:k]
+
+# ----------------- Dense + Fusion -----------------
+def dense_search(vectorstore, query_vector: List[float], k: int) -> List[Tuple[int, float]]:
+    """Nearest FAISS rows for a query embedding as (row, distance)"""
+    import numpy as np
+    distances, rows = vectorstore.index.search(np.array([query_vector], dtype=np.float32), k)
+    return [(int(row), float(dist)) for row, dist in zip(rows[0], distances[0]) if row != -1]
+
+def reciprocal_rank_fusion(rankings: List[List[Tuple[int, float]]], k: int = 60) -> List[Tuple[int, float]]:
+    """Fuse ranked lists by summing 1 / (k + rank) - no score normalization needed"""
+    fused = defaultdict(float)
+    for ranking in rankings:
+        for rank, (doc_id, _) in enumerate(ranking, start=1):
+            fused[doc_id] += 1.0 / (k + rank)
+    return sorted(fused.items(), key=lambda item: item[1], reverse=True)
+
+def retrieve_chunks(vectorstore, embeddings, query: str, index_path: str, mode: str = CHAT_RETRIEVAL,
+                    top_k: int = HYBRID_TOP_K, max_chars: Optional[int] = HYBRID_CONTEXT_CHARS,
+                    budget_ms: float = HYBRID_BUDGET_MS) -> Tuple[list, dict]:
+    """
+    Select context chunks for a chat query.
+    Returns (documents, stats) where stats has retrieval_ms, chunks and context_chars.
+    """
+    if mode not in RETRIEVAL_MODES:
+        raise ValueError(f"Unknown retrieval mode '{mode}' (expected one of {', '.join(RETRIEVAL_MODES)})")
+
+    start = time.perf_counter()
+    query_vector = embeddings.embed_query(query)
+
+    if mode == "dense":
+        ranked = dense_search(vectorstore, query_vector, DENSE_TOP_K)
+        top_k, max_chars = DENSE_TOP_K, None
+    else:
+        dense = dense_search(vectorstore, query_vector, HYBRID_CANDIDATES)
+        bm25 = load_or_build_bm25_index(vectorstore, index_path)
+        # The budget covers lexical scoring only - loading (or building a legacy folder's
+        # index on first chat) must not eat it and cut scoring down to a single term
+        deadline = time.perf_counter() + budget_ms / 1000.0
+        lexical = bm25_search(bm25, query, HYBRID_CANDIDATES, deadline)
+        ranked = reciprocal_rank_fusion([dense, lexical])
+
+    # Take fused results in order until the chunk or character budget is spent
+    docs, context_chars = [], 0
+    for row, _ in ranked:
+        doc = vectorstore.docstore.search(vectorstore.index_to_docstore_id[row])
+        if docs and max_chars is not None and context_chars + len(doc.page_content) > max_chars:
+            break
+        docs.append(doc)
+        context_chars += len(doc.page_content)
+        if len(docs) >= top_k:
+            break
+
+    stats = {
+        "mode": mode,
+        "retrieval_ms": round((time.perf_counter() - start) * 1000, 1),
+        "chunks": len(docs),
+        "context_chars": context_chars,
+    }
+    return docs, stats
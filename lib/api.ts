@@ -143,6 +143,7 @@ export async function generatePaper(folderName: string, marks: number): Promise<
   path: string;
   url: string;
   timestamp: string;
+  upload_status: 'uploading';
 }> {
   const token = await getAuthToken();
   
@@ -180,6 +181,7 @@ export async function getPapers(): Promise<{
     created_at: string;
     updated_at: string;
     size: number;
+    upload_status: 'uploaded' | 'uploading' | 'failed';
   }>;
   user_id: string;
 }> {
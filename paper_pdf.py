@@ -0,0 +1,227 @@
+# paper_pdf.py
+# Exam paper PDF rendering, run in a dedicated process pool so CPU-bound
+# ReportLab work doesn't compete with request handling in the API process.
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from io import BytesIO
+from typing import Optional, Tuple
+
+from reportlab.lib.pagesizes import A4
+from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+from reportlab.lib.units import inch
+from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer
+from reportlab.lib.enums import TA_CENTER
+from reportlab.pdfbase import pdfmetrics
+
+# Number of render worker processes (0 = render inline in the calling process)
+PDF_RENDER_WORKERS = int(os.getenv("PDF_RENDER_WORKERS", "2"))
+
+# Fonts used by the paper styles - metrics are loaded once per worker
+PAPER_FONTS = ("Helvetica", "Helvetica-Bold", "Helvetica-Oblique")
+
+_styles: Optional[dict] = None
+_pool: Optional[ProcessPoolExecutor] = None
+_pool_lock = threading.Lock()
+
+# ----------------- Styles (built once per process) -----------------
+def _build_styles() -> dict:
+    """Build the paragraph styles used for exam papers"""
+    styles = getSampleStyleSheet()
+
+    return {
+        "title": ParagraphStyle(
+            'CustomTitle',
+            parent=styles['Heading1'],
+            fontSize=18,
+            spaceAfter=12,
+            alignment=TA_CENTER,
+            fontName='Helvetica-Bold'
+        ),
+        "header": ParagraphStyle(
+            'CustomHeader',
+            parent=styles['Heading2'],
+            fontSize=14,
+            spaceAfter=10,
+            spaceBefore=15,
+            fontName='Helvetica-Bold'
+        ),
+        "normal": ParagraphStyle(
+            'CustomNormal',
+            parent=styles['Normal'],
+            fontSize=11,
+            spaceAfter=8,
+            fontName='Helvetica'
+        ),
+        "question": ParagraphStyle(
+            'Question',
+            parent=styles['Normal'],
+            fontSize=11,
+            spaceAfter=6,
+            spaceBefore=8,
+            fontName='Helvetica-Bold'
+        ),
+    }
+
+def get_styles() -> dict:
+    """Return the cached paper styles, building them on first use"""
+    global _styles
+    if _styles is None:
+        _styles = _build_styles()
+    return _styles
+
+def init_render_worker():
+    """Process pool initializer: warm up fonts and styles once per worker"""
+    for font_name in PAPER_FONTS:
+        pdfmetrics.getFont(font_name)
+    get_styles()
+
+# ----------------- PDF Rendering -----------------
+def build_paper_pdf(paper_content: str, folder_name: str, marks: int, timestamp: str) -> Tuple[bytes, int]:
+    """Convert text paper content to formatted PDF, returning (pdf_bytes, page_count)"""
+    buffer = BytesIO()
+    doc = SimpleDocTemplate(buffer, pagesize=A4, topMargin=0.75*inch, bottomMargin=0.75*inch)
+
+    styles = get_styles()
+    title_style = styles["title"]
+    header_style = styles["header"]
+    normal_style = styles["normal"]
+    question_style = styles["question"]
+
+    # Build content
+    content = []
+
+    # Title and header
+    content.append(Paragraph("EXAMINATION PAPER", title_style))
+    content.append(Spacer(1, 0.2*inch))
+    content.append(Paragraph(f"<b>Subject:</b> {folder_name}", normal_style))
+    content.append(Paragraph(f"<b>Total Marks:</b> {marks}", normal_style))
+    content.append(Paragraph(f"<b>Duration:</b> {('45 minutes' if marks == 20 else '2 hours')}", normal_style))
+    content.append(Paragraph(f"<b>Date:</b> {timestamp}", normal_style))
+    content.append(Spacer(1, 0.3*inch))
+    content.append(Paragraph("_" * 100, normal_style))
+    content.append(Spacer(1, 0.2*inch))
+
+    # Process paper content line by line
+    lines = paper_content.split('\n')
+    for line in lines:
+        line = line.strip()
+        if not line:
+            content.append(Spacer(1, 0.1*inch))
+            continue
+
+        # Section headers (Section A, Section B, etc.)
+        if line.startswith('##') or (line.startswith('Section') and ('A' in line or 'B' in line or 'C' in line)):
+            clean_line = line.replace('##', '').replace('**', '').strip()
+            content.append(Spacer(1, 0.15*inch))
+            content.append(Paragraph(clean_line, header_style))
+            continue
+
+        # Questions (Q1, Q2, or 1., 2., etc.)
+        if line.startswith(('Q', '#', '1.', '2.', '3.', '4.', '5.', '6.', '7.', '8.', '9.', '10.')):
+            clean_line = line.replace('**', '').replace('##', '').strip()
+            content.append(Paragraph(clean_line, question_style))
+            continue
+
+        # MCQ Options (A), B), C), D))
+        if line.strip().startswith(('A)', 'B)', 'C)', 'D)', 'A.', 'B.', 'C.', 'D.')):
+            clean_line = '&nbsp;&nbsp;&nbsp;&nbsp;' + line.replace('**', '').strip()
+            content.append(Paragraph(clean_line, normal_style))
+            continue
+
+        # Mark indicators [X marks]
+        if '[' in line and 'mark' in line.lower():
+            clean_line = '<i>' + line.replace('**', '').strip() + '</i>'
+            content.append(Paragraph(clean_line, normal_style))
+            continue
+
+        # Answer spaces (underscores)
+        if '_____' in line:
+            content.append(Spacer(1, 0.3*inch))
+            continue
+
+        # Regular text
+        clean_line = line.replace('**', '').replace('##', '').strip()
+        if clean_line:
+            content.append(Paragraph(clean_line, normal_style))
+
+    # Build PDF
+    doc.build(content)
+    return buffer.getvalue(), doc.page
+
+def create_pdf_paper(paper_content: str, folder_name: str, marks: int, timestamp: str) -> bytes:
+    """Convert text paper content to formatted PDF"""
+    pdf_bytes, _ = build_paper_pdf(paper_content, folder_name, marks, timestamp)
+    return pdf_bytes
+
+# ----------------- Render Worker Pool -----------------
+def pool_context():
+    """
+    Start method for render workers. forkserver keeps workers from forking the threaded
+    API process and its model heap; it doesn't exist on Windows, where spawn is used.
+    """
+    method = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+    return multiprocessing.get_context(method)
+
+def get_render_pool() -> Optional[ProcessPoolExecutor]:
+    """Return the shared render pool (worker processes start on the first submit)"""
+    global _pool
+    if PDF_RENDER_WORKERS <= 0:
+        return None
+    with _pool_lock:
+        if _pool is None:
+            _pool = ProcessPoolExecutor(
+                max_workers=PDF_RENDER_WORKERS,
+                mp_context=pool_context(),
+                initializer=init_render_worker
+            )
+        return _pool
+
+def _discard_pool(pool: ProcessPoolExecutor):
+    """Drop a broken pool (e.g. a worker was OOM-killed) so the next call starts a fresh one"""
+    global _pool
+    with _pool_lock:
+        if _pool is pool:
+            _pool = None
+    pool.shutdown(wait=False, cancel_futures=True)
+
+def _run_in_pool(fn, *args):
+    """Run fn in the render pool, restarting the pool once if a worker has died"""
+    pool = get_render_pool()
+    if pool is None:
+        return fn(*args)
+    try:
+        return pool.submit(fn, *args).result()
+    except BrokenProcessPool:
+        print("⚠️  PDF render worker died - restarting the render pool")
+        _discard_pool(pool)
+        return get_render_pool().submit(fn, *args).result()
+
+def _worker_ready() -> bool:
+    return True
+
+def warm_render_pool():
+    """Start every render worker now so the first paper doesn't pay for process startup"""
+    pool = get_render_pool()
+    if pool is None:
+        init_render_worker()
+        return
+    try:
+        for future in [pool.submit(_worker_ready) for _ in range(PDF_RENDER_WORKERS)]:
+            future.result()
+    except BrokenProcessPool:
+        _discard_pool(pool)
+        raise
+
+def render_pdf_paper(paper_content: str, folder_name: str, marks: int, timestamp: str) -> bytes:
+    """Render an exam paper PDF in the worker pool (blocks the caller, not the GIL)"""
+    return _run_in_pool(create_pdf_paper, paper_content, folder_name, marks, timestamp)
+
+def shutdown_render_pool():
+    """Stop the render workers (called on app shutdown)"""
+    global _pool
+    if _pool is not None:
+        _pool.shutdown(wait=False, cancel_futures=True)
+        _pool = None
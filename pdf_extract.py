@@ -0,0 +1,190 @@
+# pdf_extract.py
+# PDF text extraction for indexing: large PDFs are split into page ranges that are
+# extracted in parallel, and the page text is persisted by file content hash so a
+# re-index / re-chunk / embedding model change never parses the same PDF twice.
+import hashlib
+import json
+import multiprocessing
+import os
+import tempfile
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Dict, List, Optional, Tuple
+
+# Persisted page text: {EXTRACT_CACHE_DIR}/{sha256}.{engine}.json
+EXTRACT_CACHE_DIR = os.getenv("EXTRACT_CACHE_DIR", "./data/extracted")
+
+# Extraction engine name (see ENGINES below)
+PDF_EXTRACT_ENGINE = os.getenv("PDF_EXTRACT_ENGINE", "pypdf")
+
+def _default_extract_workers() -> int:
+    """CPUs this process may run on (not the host's count), capped at 4 to bound memory"""
+    try:
+        cpus = len(os.sched_getaffinity(0))
+    except AttributeError:  # not available on macOS / Windows
+        cpus = os.cpu_count() or 1
+    return min(4, cpus)
+
+# Worker processes for page-range extraction (0 = extract inline)
+PDF_EXTRACT_WORKERS = int(os.getenv("PDF_EXTRACT_WORKERS") or _default_extract_workers())
+
+# Pages per range - PDFs with fewer pages than this are extracted inline
+PDF_EXTRACT_RANGE_PAGES = int(os.getenv("PDF_EXTRACT_RANGE_PAGES", "50"))
+
+_pool: Optional[ProcessPoolExecutor] = None
+_pool_lock = threading.Lock()
+
+# ----------------- Extraction Engines -----------------
+class PyPdfEngine:
+    """Plain-text extraction with pypdf (same output as PyPDFLoader)"""
+    name = "pypdf"
+
+    def page_count(self, path: str) -> int:
+        from pypdf import PdfReader
+        return len(PdfReader(path).pages)
+
+    def extract_range(self, path: str, start: int, end: int) -> List[str]:
+        from pypdf import PdfReader
+        reader = PdfReader(path)
+        return [reader.pages[i].extract_text() for i in range(start, end)]
+
+# Register additional engines here (name -> class with page_count/extract_range)
+ENGINES = {
+    PyPdfEngine.name: PyPdfEngine,
+}
+
+def get_engine(name: str = PDF_EXTRACT_ENGINE):
+    if name not in ENGINES:
+        raise ValueError(f"Unknown PDF extraction engine '{name}' (expected one of {', '.join(ENGINES)})")
+    return ENGINES[name]()
+
+def _extract_range(engine_name: str, path: str, start: int, end: int) -> List[str]:
+    """Worker entry point: extract pages [start, end) of one PDF"""
+    return get_engine(engine_name).extract_range(path, start, end)
+
+# ----------------- Extraction Worker Pool -----------------
+def pool_context():
+    """
+    Start method for extraction workers. index_folder runs on a worker thread of the API
+    process after torch and the embedding model have loaded, and workers only need pypdf,
+    so avoid fork: forkserver where available, spawn otherwise (e.g. Windows).
+    """
+    method = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+    return multiprocessing.get_context(method)
+
+def get_extract_pool() -> Optional[ProcessPoolExecutor]:
+    """Return the shared extraction pool (worker processes start on the first submit)"""
+    global _pool
+    if PDF_EXTRACT_WORKERS <= 0:
+        return None
+    with _pool_lock:
+        if _pool is None:
+            _pool = ProcessPoolExecutor(
+                max_workers=PDF_EXTRACT_WORKERS,
+                mp_context=pool_context()
+            )
+        return _pool
+
+def _discard_pool(pool: ProcessPoolExecutor):
+    """Drop a broken pool (a worker died) so the next extraction starts a fresh one"""
+    global _pool
+    with _pool_lock:
+        if _pool is pool:
+            _pool = None
+    pool.shutdown(wait=False, cancel_futures=True)
+
+def shutdown_extract_pool():
+    """Stop the extraction workers (called on app shutdown)"""
+    global _pool
+    if _pool is not None:
+        _pool.shutdown(wait=False, cancel_futures=True)
+        _pool = None
+
+# ----------------- Extracted Text Cache -----------------
+def content_hash(file_data: bytes) -> str:
+    return hashlib.sha256(file_data).hexdigest()
+
+def _cache_path(file_hash: str, engine_name: str) -> str:
+    return os.path.join(EXTRACT_CACHE_DIR, f"{file_hash}.{engine_name}.json")
+
+def load_cached_pages(file_hash: str, engine_name: str = PDF_EXTRACT_ENGINE) -> Optional[List[str]]:
+    """Return cached page text for a file hash, or None on a miss"""
+    try:
+        with open(_cache_path(file_hash, engine_name), "r", encoding="utf-8") as f:
+            return json.load(f)["pages"]
+    except (OSError, ValueError, KeyError):
+        return None
+
+def save_cached_pages(file_hash: str, pages: List[str], engine_name: str = PDF_EXTRACT_ENGINE):
+    """Persist page text atomically so a crash never leaves a partial entry"""
+    os.makedirs(EXTRACT_CACHE_DIR, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=EXTRACT_CACHE_DIR, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump({"engine": engine_name, "pages": pages}, f)
+        os.replace(tmp_path, _cache_path(file_hash, engine_name))
+    except Exception:
+        os.unlink(tmp_path)
+        raise
+
+# ----------------- Extraction -----------------
+def extract_pages_from_file(path: str, engine_name: str = PDF_EXTRACT_ENGINE) -> List[str]:
+    """Extract every page of a PDF on disk, fanning large files out across the pool"""
+    engine = get_engine(engine_name)
+    num_pages = engine.page_count(path)
+    pool = get_extract_pool()
+
+    if pool is None or num_pages <= PDF_EXTRACT_RANGE_PAGES:
+        return engine.extract_range(path, 0, num_pages)
+
+    ranges = [
+        (start, min(start + PDF_EXTRACT_RANGE_PAGES, num_pages))
+        for start in range(0, num_pages, PDF_EXTRACT_RANGE_PAGES)
+    ]
+    try:
+        return _extract_ranges(pool, engine_name, path, ranges)
+    except BrokenProcessPool:
+        print("⚠️  PDF extraction worker died - restarting the extraction pool")
+        _discard_pool(pool)
+        return _extract_ranges(get_extract_pool(), engine_name, path, ranges)
+
+def _extract_ranges(pool: ProcessPoolExecutor, engine_name: str, path: str, ranges) -> List[str]:
+    futures = [pool.submit(_extract_range, engine_name, path, start, end) for start, end in ranges]
+    pages = []
+    for future in futures:
+        pages.extend(future.result())
+    return pages
+
+def extract_pdf(file_data: bytes, engine_name: str = PDF_EXTRACT_ENGINE) -> Tuple[List[str], Dict]:
+    """
+    Return (page_texts, stats) for a PDF's bytes, using the persisted cache when possible.
+    stats: {"hash", "pages", "seconds", "pages_per_sec", "cached"}
+    """
+    start = time.perf_counter()
+    file_hash = content_hash(file_data)
+
+    pages = load_cached_pages(file_hash, engine_name)
+    cached = pages is not None
+
+    if not cached:
+        # Engines read from disk so workers can open the file independently
+        with tempfile.NamedTemporaryFile(delete=False, suffix=".pdf") as tmp_file:
+            tmp_file.write(file_data)
+            tmp_path = tmp_file.name
+        try:
+            pages = extract_pages_from_file(tmp_path, engine_name)
+        finally:
+            os.unlink(tmp_path)
+        save_cached_pages(file_hash, pages, engine_name)
+
+    elapsed = time.perf_counter() - start
+    stats = {
+        "hash": file_hash,
+        "pages": len(pages),
+        "seconds": round(elapsed, 3),
+        "pages_per_sec": round(len(pages) / elapsed, 1) if elapsed > 0 else None,
+        "cached": cached,
+    }
+    return pages, stats
@@ -1,25 +1,21 @@
 # server.py
-from fastapi import FastAPI, HTTPException, Header, Depends
-from fastapi.middleware.cors import CORSMiddleware
-from pydantic import BaseModel
-import os, tempfile
-from langchain_huggingface import HuggingFaceEmbeddings
-from langchain_community.vectorstores import FAISS
-from langchain_community.document_loaders import PyPDFLoader
-from langchain.text_splitter import RecursiveCharacterTextSplitter
-from langchain.chains import RetrievalQA
-from langchain.prompts import PromptTemplate
-from langchain_groq import ChatGroq
-from dotenv import load_dotenv
-from supabase import create_client, Client
+# Heavy dependencies (langchain, sentence-transformers/torch, faiss, reportlab) are
+# imported lazily per subsystem - see "Lazy Subsystem Loaders" and "Warm-up" below.
+from startup import timed, print_breakdown, run_warmup, step_recovered, mark_ready, is_ready, readiness_status
+
+with timed("import", "fastapi + pydantic"):
+    from fastapi import FastAPI, HTTPException, Header, Depends, BackgroundTasks
+    from fastapi.middleware.cors import CORSMiddleware
+    from fastapi.responses import JSONResponse
+    from pydantic import BaseModel, Field, model_validator
+import os, threading, time
+from functools import lru_cache
 from typing import Optional
-import jwt
-from reportlab.lib.pagesizes import A4
-from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-from reportlab.lib.units import inch
-from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer
-from reportlab.lib.enums import TA_CENTER
-from io import BytesIO
+with timed("import", "dotenv + jwt"):
+    from dotenv import load_dotenv
+    import jwt
+with timed("import", "supabase"):
+    from supabase import create_client, Client
 
 load_dotenv()
 
@@ -32,6 +28,19 @@ if LANGCHAIN_TRACING:
 else:
     print("⚠️  LangSmith tracing disabled (set LANGCHAIN_TRACING_V2=true to enable)")
 
+# Warm-up configuration
+# WARMUP_STEPS: comma-separated subsystems to load before reporting ready ("none" = lazy only)
+# WARMUP_BLOCKING: run warm-up before the server accepts connections instead of in the background
+WARMUP_STEPS = [
+    step.strip() for step in os.getenv("WARMUP_STEPS", "pdf,faiss,llm,embeddings").split(",")
+    if step.strip() and step.strip().lower() != "none"
+]
+WARMUP_BLOCKING = os.getenv("WARMUP_BLOCKING", "false").lower() == "true"
+# WARMUP_ATTEMPTS: tries per step before the process is left degraded (not ready)
+WARMUP_ATTEMPTS = int(os.getenv("WARMUP_ATTEMPTS", "3"))
+
+EMBEDDING_MODEL = "sentence-transformers/all-MiniLM-L6-v2"
+
 app = FastAPI()
 
 # CORS middleware
@@ -74,13 +83,138 @@ if SUPABASE_SERVICE_KEY:
 else:
     print("⚠️  Using Supabase Anon Key (RLS policies apply)")
 
-supabase: Client = create_client(SUPABASE_URL, SUPABASE_KEY)
+with timed("import", "supabase client"):
+    supabase: Client = create_client(SUPABASE_URL, SUPABASE_KEY)
 
 INDEX_DIR = "./data/indexes"  # Local storage for FAISS indexes
 
+print_breakdown("import")
+
+# ----------------- Lazy Subsystem Loaders -----------------
+# Each loader imports its subsystem on first use and records the import time.
+_embeddings = None
+_embeddings_lock = threading.Lock()
+
+def get_embeddings():
+    """Shared HuggingFace embedding model (imports sentence-transformers/torch)"""
+    global _embeddings
+    if _embeddings is None:
+        with _embeddings_lock:
+            if _embeddings is None:
+                with timed("lazy import", "langchain_huggingface (sentence-transformers, torch)"):
+                    from langchain_huggingface import HuggingFaceEmbeddings
+                _embeddings = HuggingFaceEmbeddings(model_name=EMBEDDING_MODEL)
+                # If the warm-up step failed (e.g. model download), this lazy load flips readiness
+                step_recovered("embeddings")
+    return _embeddings
+
+@lru_cache(maxsize=None)
+def faiss_store():
+    """FAISS vector store class (imports faiss + langchain_community)"""
+    with timed("lazy import", "langchain_community.vectorstores (faiss)"):
+        from langchain_community.vectorstores import FAISS
+    return FAISS
+
+@lru_cache(maxsize=None)
+def pdf_extractor():
+    """PDF page text extraction module (imports pypdf in workers)"""
+    with timed("lazy import", "pdf_extract"):
+        import pdf_extract
+    return pdf_extract
+
+@lru_cache(maxsize=None)
+def document_class():
+    """LangChain Document class"""
+    with timed("lazy import", "langchain_core.documents"):
+        from langchain_core.documents import Document
+    return Document
+
+@lru_cache(maxsize=None)
+def text_splitter():
+    """RecursiveCharacterTextSplitter class"""
+    with timed("lazy import", "langchain.text_splitter"):
+        from langchain.text_splitter import RecursiveCharacterTextSplitter
+    return RecursiveCharacterTextSplitter
+
+@lru_cache(maxsize=None)
+def groq_chat():
+    """ChatGroq LLM class (imports langchain_groq)"""
+    with timed("lazy import", "langchain_groq"):
+        from langchain_groq import ChatGroq
+    return ChatGroq
+
+@lru_cache(maxsize=None)
+def prompt_class():
+    """PromptTemplate class"""
+    with timed("lazy import", "langchain.prompts"):
+        from langchain.prompts import PromptTemplate
+    return PromptTemplate
+
+@lru_cache(maxsize=None)
+def search_engine():
+    """Hybrid BM25 + dense retrieval module"""
+    with timed("lazy import", "hybrid_search"):
+        import hybrid_search
+    return hybrid_search
+
+@lru_cache(maxsize=None)
+def paper_renderer():
+    """Exam paper PDF module (imports reportlab)"""
+    with timed("lazy import", "paper_pdf (reportlab)"):
+        import paper_pdf
+    return paper_pdf
+
+# ----------------- Warm-up -----------------
+WARMUP_TASKS = {
+    "pdf": lambda: paper_renderer().warm_render_pool(),
+    "faiss": lambda: (faiss_store(), pdf_extractor(), document_class(), text_splitter(), search_engine()),
+    "llm": lambda: (groq_chat(), prompt_class()),
+    "embeddings": lambda: get_embeddings().embed_query("warm-up"),
+}
+
+def warm_up():
+    """Load the configured subsystems, then mark the process ready for traffic"""
+    steps = {}
+    for name in WARMUP_STEPS:
+        if name in WARMUP_TASKS:
+            steps[name] = WARMUP_TASKS[name]
+        else:
+            print(f"⚠️  Unknown warm-up step '{name}' (expected one of {', '.join(WARMUP_TASKS)})")
+    run_warmup(steps, attempts=WARMUP_ATTEMPTS)
+    print_breakdown("lazy import")
+    if is_ready():
+        print("✅ Ready to serve traffic")
+
+@app.on_event("startup")
+def start_warmup():
+    if not WARMUP_STEPS:
+        mark_ready()
+    elif WARMUP_BLOCKING:
+        warm_up()
+    else:
+        # Liveness stays up while the models load; readiness flips once done
+        threading.Thread(target=warm_up, name="warm-up", daemon=True).start()
+
+@app.on_event("shutdown")
+def stop_worker_pools():
+    if paper_renderer.cache_info().currsize:
+        paper_renderer().shutdown_render_pool()
+    if pdf_extractor.cache_info().currsize:
+        pdf_extractor().shutdown_extract_pool()
+
 # Pydantic models
 class IndexRequest(BaseModel):
     folder_name: str
+    # Chunking - re-indexing with new values reuses the cached page text
+    chunk_size: int = Field(1500, gt=0)
+    chunk_overlap: int = Field(300, ge=0)
+
+    @model_validator(mode="after")
+    def check_chunk_overlap(self):
+        # Rejected with a 422 up front instead of failing in the splitter after extraction
+        if self.chunk_overlap >= self.chunk_size:
+            raise ValueError("chunk_overlap must be smaller than chunk_size")
+        return self
 
 class ChatRequest(BaseModel):
     folder_name: str
@@ -163,6 +297,7 @@ def index_folder(request: IndexRequest, user_id: str = Depends(get_current_user)
             raise HTTPException(404, f"No PDF files found in folder '{folder_name}'")
         
         docs = []
+        extraction = []
         
         # Download and process each PDF
         for file_obj in pdf_files:
@@ -175,18 +310,17 @@ def index_folder(request: IndexRequest, user_id: str = Depends(get_current_user)
             # Download file from Supabase Storage
             file_data = supabase.storage.from_("folders").download(file_path)
             
-            # Save temporarily to process with PyPDFLoader
-            with tempfile.NamedTemporaryFile(delete=False, suffix=".pdf") as tmp_file:
-                tmp_file.write(file_data)
-                tmp_path = tmp_file.name
+            # Extract page text (parallel for large PDFs, cached by content hash)
+            pages, stats = pdf_extractor().extract_pdf(file_data)
+            print(f"Extracted {file_name}: {stats['pages']} pages in {stats['seconds']}s "
+                  f"({stats['pages_per_sec']} pages/sec{', cached' if stats['cached'] else ''})")
+            extraction.append({"file": file_name, **stats})
             
-            try:
-                # Load PDF
-                loader = PyPDFLoader(tmp_path)
-                docs += loader.load()
-            finally:
-                # Clean up temp file
-                os.unlink(tmp_path)
+            Document = document_class()
+            docs += [
+                Document(page_content=text, metadata={"source": file_path, "page": page_num})
+                for page_num, text in enumerate(pages)
+            ]
         
         if not docs:
             raise HTTPException(400, "No content extracted from PDFs")
@@ -194,29 +328,33 @@ def index_folder(request: IndexRequest, user_id: str = Depends(get_current_user)
         # Split documents into chunks
         # Larger chunks = more context but less precise
         # Smaller chunks = more precise but may miss context
-        splitter = RecursiveCharacterTextSplitter(
-            chunk_size=1500,  # Increased for better context
-            chunk_overlap=300,  # Increased overlap to maintain continuity
+        splitter = text_splitter()(
+            chunk_size=request.chunk_size,
+            chunk_overlap=request.chunk_overlap,
             separators=["\n\n", "\n", ". ", " ", ""]  # Split on natural boundaries
         )
         chunks = splitter.split_documents(docs)
         
         # Create embeddings and FAISS index (HuggingFace - FREE, no API key needed)
-        embeddings = HuggingFaceEmbeddings(
-            model_name="sentence-transformers/all-MiniLM-L6-v2"
-        )
-        vectorstore = FAISS.from_documents(chunks, embeddings)
+        embeddings = get_embeddings()
+        vectorstore = faiss_store().from_documents(chunks, embeddings)
         
         # Save FAISS index locally
         index_path = os.path.join(INDEX_DIR, user_id)
         os.makedirs(index_path, exist_ok=True)
-        vectorstore.save_local(os.path.join(index_path, f"{folder_name}_faiss"))
+        faiss_path = os.path.join(index_path, f"{folder_name}_faiss")
+        vectorstore.save_local(faiss_path)
+        
+        # BM25 inverted index over the same chunks (doc id = FAISS row) for hybrid chat retrieval
+        search = search_engine()
+        search.save_bm25_index(search.build_bm25_index([chunk.page_content for chunk in chunks]), faiss_path)
         
         return {
             "status": "indexed",
             "folder": folder_name,
             "files_processed": len(pdf_files),
-            "chunks_created": len(chunks)
+            "chunks_created": len(chunks),
+            "extraction": extraction
         }
         
     except Exception as e:
@@ -241,26 +379,19 @@ def chat(request: ChatRequest, user_id: str = Depends(get_current_user)):
     
     try:
         # Load FAISS index
-        embeddings = HuggingFaceEmbeddings(
-            model_name="sentence-transformers/all-MiniLM-L6-v2"
-        )
-        vectorstore = FAISS.load_local(
+        embeddings = get_embeddings()
+        vectorstore = faiss_store().load_local(
             index_path, 
             embeddings,
             allow_dangerous_deserialization=True  # ⚠ Only safe for your own files
         )
-        # Retrieve more chunks for better context
-        # k=10 means top 10 most relevant chunks will be used
-        retriever = vectorstore.as_retriever(
-            search_type="similarity",  # or "mmr" for diversity
-            search_kwargs={
-                "k": 10,  # Increased from 6 to 10 for more context
-                "fetch_k": 20  # Fetch 20, then filter to top 10
-            }
-        )
+        # Hybrid BM25 + dense retrieval: fewer, higher-precision chunks than plain top-10
+        # similarity, which keeps the prompt short (CHAT_RETRIEVAL=dense restores the old setup)
+        docs, retrieval = search_engine().retrieve_chunks(vectorstore, embeddings, query_text, index_path)
+        context = "\n\n".join(doc.page_content for doc in docs)
         
         # Initialize LLM
-        llm = ChatGroq(
+        llm = groq_chat()(
             model="openai/gpt-oss-20b",
             temperature=0,  # 0 for factual, 0.7 for creative
             max_tokens=None,
@@ -288,26 +419,24 @@ Instructions:
 
 Answer:"""
 
+        PromptTemplate = prompt_class()
         PROMPT = PromptTemplate(
             template=prompt_template,
             input_variables=["context", "question"]
         )
         
-        # Create QA chain with custom prompt
-        qa = RetrievalQA.from_chain_type(
-            llm=llm,
-            chain_type="stuff",  # "stuff" puts all context in one prompt
-            retriever=retriever,
-            return_source_documents=False,
-            chain_type_kwargs={"prompt": PROMPT}
-        )
+        # All selected chunks go into one prompt (same as the "stuff" chain)
+        prompt = PROMPT.format(context=context, question=query_text)
+        retrieval["prompt_tokens_est"] = search_engine().estimate_tokens(prompt)
+        print(f"Chat retrieval: {retrieval}")
         
-        answer = qa.run(query_text)
+        answer = llm.invoke(prompt).content
         
         return {
             "answer": answer,
             "folder": folder_name,
-            "user_id": user_id
+            "user_id": user_id,
+            "retrieval": retrieval
         }
         
     except Exception as e:
@@ -350,8 +479,8 @@ def generate_mcqs(request: MCQRequest, user_id: str = Depends(get_current_user))
     
     try:
         # Load FAISS index (same as chat)
-        embeddings = HuggingFaceEmbeddings(model_name="sentence-transformers/all-MiniLM-L6-v2")
-        vectorstore = FAISS.load_local(index_path, embeddings, allow_dangerous_deserialization=True)
+        embeddings = get_embeddings()
+        vectorstore = faiss_store().load_local(index_path, embeddings, allow_dangerous_deserialization=True)
         
         # Get diverse chunks
         retriever = vectorstore.as_retriever(
@@ -367,7 +496,7 @@ def generate_mcqs(request: MCQRequest, user_id: str = Depends(get_current_user))
         context = "\n\n".join([doc.page_content for doc in docs])[:8000]
         
         # Initialize LLM
-        llm = ChatGroq(model="openai/gpt-oss-20b", temperature=0.7, max_tokens=4000)
+        llm = groq_chat()(model="openai/gpt-oss-20b", temperature=0.7, max_tokens=4000)
         
         # Prompt
         prompt = f"""You are an expert teacher. Generate EXACTLY {num_questions} multiple-choice questions.
@@ -408,115 +537,56 @@ Generate {num_questions} questions with 4 options each."""
     except Exception as e:
         raise HTTPException(500, f"Error generating MCQs: {str(e)}")
 
-# ----------------- PDF Generation Helper -----------------
-def create_pdf_paper(paper_content: str, folder_name: str, marks: int, timestamp: str) -> bytes:
-    """Convert text paper content to formatted PDF"""
-    buffer = BytesIO()
-    doc = SimpleDocTemplate(buffer, pagesize=A4, topMargin=0.75*inch, bottomMargin=0.75*inch)
-    
-    # Styles
-    styles = getSampleStyleSheet()
-    
-    title_style = ParagraphStyle(
-        'CustomTitle',
-        parent=styles['Heading1'],
-        fontSize=18,
-        spaceAfter=12,
-        alignment=TA_CENTER,
-        fontName='Helvetica-Bold'
-    )
-    
-    header_style = ParagraphStyle(
-        'CustomHeader',
-        parent=styles['Heading2'],
-        fontSize=14,
-        spaceAfter=10,
-        spaceBefore=15,
-        fontName='Helvetica-Bold'
-    )
-    
-    normal_style = ParagraphStyle(
-        'CustomNormal',
-        parent=styles['Normal'],
-        fontSize=11,
-        spaceAfter=8,
-        fontName='Helvetica'
-    )
-    
-    question_style = ParagraphStyle(
-        'Question',
-        parent=styles['Normal'],
-        fontSize=11,
-        spaceAfter=6,
-        spaceBefore=8,
-        fontName='Helvetica-Bold'
-    )
-    
-    # Build content
-    content = []
-    
-    # Title and header
-    content.append(Paragraph("EXAMINATION PAPER", title_style))
-    content.append(Spacer(1, 0.2*inch))
-    content.append(Paragraph(f"<b>Subject:</b> {folder_name}", normal_style))
-    content.append(Paragraph(f"<b>Total Marks:</b> {marks}", normal_style))
-    content.append(Paragraph(f"<b>Duration:</b> {('45 minutes' if marks == 20 else '2 hours')}", normal_style))
-    content.append(Paragraph(f"<b>Date:</b> {timestamp}", normal_style))
-    content.append(Spacer(1, 0.3*inch))
-    content.append(Paragraph("_" * 100, normal_style))
-    content.append(Spacer(1, 0.2*inch))
+# ----------------- Paper Upload (runs after the response is sent) -----------------
+# Papers whose background upload hasn't landed yet (or failed), reported by /get_papers
+# (failed entries are dropped once /get_papers has reported them)
+# {user_id: {paper_path: paper}} - kept in process memory
+PAPER_UPLOAD_RETRIES = 3
+_paper_uploads: dict = {}
+_paper_uploads_lock = threading.Lock()
+
+def upload_paper(user_id: str, paper_path: str, pdf_bytes: bytes):
+    """Upload a rendered paper PDF to Supabase Storage, retrying with backoff"""
+    # Create papers folder if doesn't exist
+    try:
+        supabase.storage.from_("folders").upload(
+            f"{user_id}/papers/.placeholder",
+            b"",
+            {"content-type": "text/plain"}
+        )
+    except:
+        pass  # Folder might already exist
     
-    # Process paper content line by line
-    lines = paper_content.split('\n')
-    for line in lines:
-        line = line.strip()
-        if not line:
-            content.append(Spacer(1, 0.1*inch))
-            continue
-        
-        # Section headers (Section A, Section B, etc.)
-        if line.startswith('##') or (line.startswith('Section') and ('A' in line or 'B' in line or 'C' in line)):
-            clean_line = line.replace('##', '').replace('**', '').strip()
-            content.append(Spacer(1, 0.15*inch))
-            content.append(Paragraph(clean_line, header_style))
-            continue
-        
-        # Questions (Q1, Q2, or 1., 2., etc.)
-        if line.startswith(('Q', '#', '1.', '2.', '3.', '4.', '5.', '6.', '7.', '8.', '9.', '10.')):
-            clean_line = line.replace('**', '').replace('##', '').strip()
-            content.append(Paragraph(clean_line, question_style))
-            continue
-        
-        # MCQ Options (A), B), C), D))
-        if line.strip().startswith(('A)', 'B)', 'C)', 'D)', 'A.', 'B.', 'C.', 'D.')):
-            clean_line = '&nbsp;&nbsp;&nbsp;&nbsp;' + line.replace('**', '').strip()
-            content.append(Paragraph(clean_line, normal_style))
-            continue
-        
-        # Mark indicators [X marks]
-        if '[' in line and 'mark' in line.lower():
-            clean_line = '<i>' + line.replace('**', '').strip() + '</i>'
-            content.append(Paragraph(clean_line, normal_style))
-            continue
-        
-        # Answer spaces (underscores)
-        if '_____' in line:
-            content.append(Spacer(1, 0.3*inch))
-            continue
-        
-        # Regular text
-        clean_line = line.replace('**', '').replace('##', '').strip()
-        if clean_line:
-            content.append(Paragraph(clean_line, normal_style))
+    error = None
+    for attempt in range(1, PAPER_UPLOAD_RETRIES + 1):
+        try:
+            # upsert so a retry after a partially applied attempt doesn't fail as a duplicate
+            supabase.storage.from_("folders").upload(
+                paper_path,
+                pdf_bytes,
+                {"content-type": "application/pdf", "upsert": "true"}
+            )
+            with _paper_uploads_lock:
+                user_uploads = _paper_uploads.get(user_id, {})
+                user_uploads.pop(paper_path, None)
+                if not user_uploads:
+                    _paper_uploads.pop(user_id, None)
+            return
+        except Exception as e:
+            error = str(e)
+            print(f"Error uploading paper {paper_path} (attempt {attempt}/{PAPER_UPLOAD_RETRIES}): {e}")
+            if attempt < PAPER_UPLOAD_RETRIES:
+                time.sleep(2 ** attempt)
     
-    # Build PDF
-    doc.build(content)
-    buffer.seek(0)
-    return buffer.read()
+    with _paper_uploads_lock:
+        paper = _paper_uploads.get(user_id, {}).get(paper_path)
+        if paper:
+            paper["upload_status"] = "failed"
+            paper["upload_error"] = error
 
 # ----------------- Generate Paper -----------------
 @app.post("/generate_paper")
-def generate_paper(request: PaperRequest, user_id: str = Depends(get_current_user)):
+def generate_paper(request: PaperRequest, background_tasks: BackgroundTasks, user_id: str = Depends(get_current_user)):
     """Generate exam paper (20 or 60 marks) and store in Supabase"""
     import datetime
     
@@ -534,8 +604,8 @@ def generate_paper(request: PaperRequest, user_id: str = Depends(get_current_use
     
     try:
         # Load FAISS index
-        embeddings = HuggingFaceEmbeddings(model_name="sentence-transformers/all-MiniLM-L6-v2")
-        vectorstore = FAISS.load_local(index_path, embeddings, allow_dangerous_deserialization=True)
+        embeddings = get_embeddings()
+        vectorstore = faiss_store().load_local(index_path, embeddings, allow_dangerous_deserialization=True)
         
         # Get comprehensive chunks for paper generation
         chunk_count = 30 if marks == 20 else 50
@@ -553,7 +623,7 @@ def generate_paper(request: PaperRequest, user_id: str = Depends(get_current_use
         context = "\n\n".join([doc.page_content for doc in docs])[:context_limit]
         
         # Initialize LLM
-        llm = ChatGroq(model="openai/gpt-oss-20b", temperature=0.7, max_tokens=6000)
+        llm = groq_chat()(model="openai/gpt-oss-20b", temperature=0.7, max_tokens=6000)
         
         # Create paper structure based on marks
         if marks == 20:
@@ -618,30 +688,28 @@ Generate the complete QUESTION PAPER only. NO ANSWER GUIDE."""
         timestamp = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
         safe_timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
         
-        # Generate PDF
-        pdf_bytes = create_pdf_paper(paper_content, folder_name, marks, timestamp)
+        # Generate PDF in the render worker pool
+        pdf_bytes = paper_renderer().render_pdf_paper(paper_content, folder_name, marks, timestamp)
         
-        # Upload to Supabase Storage
+        # Upload to Supabase Storage once the response has been sent
         # Path: {user_id}/papers/{folder_name}_{marks}marks_{timestamp}.pdf
         paper_filename = f"{folder_name}_{marks}marks_{safe_timestamp}.pdf"
         paper_path = f"{user_id}/papers/{paper_filename}"
         
-        # Create papers folder if doesn't exist
-        try:
-            supabase.storage.from_("folders").upload(
-                f"{user_id}/papers/.placeholder",
-                b"",
-                {"content-type": "text/plain"}
-            )
-        except:
-            pass  # Folder might already exist
-        
-        # Upload PDF
-        upload_result = supabase.storage.from_("folders").upload(
-            paper_path,
-            pdf_bytes,
-            {"content-type": "application/pdf"}
-        )
+        # Track the upload so /get_papers can report it as uploading / failed
+        created_at = datetime.datetime.now(datetime.timezone.utc).isoformat()
+        with _paper_uploads_lock:
+            _paper_uploads.setdefault(user_id, {})[paper_path] = {
+                "filename": paper_filename,
+                "folder": folder_name,
+                "marks": marks,
+                "path": paper_path,
+                "created_at": created_at,
+                "updated_at": created_at,
+                "size": len(pdf_bytes),
+                "upload_status": "uploading"
+            }
+        background_tasks.add_task(upload_paper, user_id, paper_path, pdf_bytes)
         
         # Get public URL
         paper_url = supabase.storage.from_("folders").get_public_url(paper_path)
@@ -653,7 +721,8 @@ Generate the complete QUESTION PAPER only. NO ANSWER GUIDE."""
             "filename": paper_filename,
             "path": paper_path,
             "url": paper_url,
-            "timestamp": timestamp
+            "timestamp": timestamp,
+            "upload_status": "uploading"
         }
         
     except Exception as e:
@@ -667,10 +736,7 @@ def get_papers(user_id: str = Depends(get_current_user)):
         papers_path = f"{user_id}/papers"
         
         # List all files in papers folder
-        files_list = supabase.storage.from_("folders").list(papers_path)
-        
-        if not files_list:
-            return {"papers": [], "user_id": user_id}
+        files_list = supabase.storage.from_("folders").list(papers_path) or []
         
         # Filter out placeholder and parse paper details
         papers = []
@@ -703,12 +769,26 @@ def get_papers(user_id: str = Depends(get_current_user)):
                     "path": f"{papers_path}/{filename}",
                     "created_at": file_obj.get("created_at"),
                     "updated_at": file_obj.get("updated_at"),
-                    "size": file_obj.get("metadata", {}).get("size", 0)
+                    "size": file_obj.get("metadata", {}).get("size", 0),
+                    "upload_status": "uploaded"
                 })
             except:
                 # Skip files that don't match expected format
                 continue
         
+        # Add papers whose background upload is still running or has failed
+        stored_paths = {paper["path"] for paper in papers}
+        with _paper_uploads_lock:
+            user_uploads = _paper_uploads.get(user_id, {})
+            pending = [dict(paper) for paper in user_uploads.values()]
+            # A failed upload is reported once, then forgotten (the user generates it again)
+            for paper in pending:
+                if paper["upload_status"] == "failed":
+                    user_uploads.pop(paper["path"], None)
+            if not user_uploads:
+                _paper_uploads.pop(user_id, None)
+        papers +=[paper for paper in pending if paper["path"] not in stored_paths]
+        
         # Sort by creation date (newest first)
         papers.sort(key=lambda x: x.get("created_at", ""), reverse=True)
         
@@ -717,10 +797,25 @@ def get_papers(user_id: str = Depends(get_current_user)):
     except Exception as e:
         raise HTTPException(500, f"Error fetching papers: {str(e)}")
 
-# ----------------- Health Check -----------------
+# ----------------- Health Checks -----------------
+@app.get("/health/live")
+def liveness_check():
+    """Process is up and serving requests (may still be warming up)"""
+    return {"status": "ok", "service": "PadhAI RAG API"}
+
+@app.get("/health/ready")
+def readiness_check():
+    """Warm-up finished - safe to route traffic here"""
+    status = readiness_status()
+    if not status["ready"]:
+        # "warming_up" while warm-up runs, "degraded" if a step failed every attempt
+        return JSONResponse(status_code=503, content={"status": status["state"], "service": "PadhAI RAG API", **status})
+    return {"status": "ok", "service": "PadhAI RAG API", **status}
+
 @app.get("/health")
 def health_check():
-    return {"status": "ok", "service": "PadhAI RAG API"}
+    # Load balancers route on /health, so it reports readiness
+    return readiness_check()
 
 # ----------------- Debug: List All Files -----------------
 @app.get("/debug/list_storage/{user_folder}")
@@ -0,0 +1,100 @@
+# startup.py
+# Startup timing and readiness tracking for the API process.
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, Dict, List, Tuple
+
+# (phase, name, seconds) in the order they were recorded
+STARTUP_TIMINGS: List[Tuple[str, str, float]] = []
+
+_ready = threading.Event()
+_warmup_errors: Dict[str, str] = {}
+_warmup_running = True
+_state_lock = threading.Lock()
+
+@contextmanager
+def timed(phase: str, name: str):
+    """Record how long the wrapped block takes under phase/name"""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        STARTUP_TIMINGS.append((phase, name, time.perf_counter() - start))
+
+def print_breakdown(phase: str):
+    """Print the recorded timings for one phase, slowest first"""
+    rows = [(name, secs) for p, name, secs in STARTUP_TIMINGS if p == phase]
+    if not rows:
+        return
+    total = sum(secs for _, secs in rows)
+    print(f"⏱️  {phase} breakdown ({total:.2f}s total):")
+    for name, secs in sorted(rows, key=lambda r: r[1], reverse=True):
+        print(f"   {secs:7.2f}s  {name}")
+
+def run_warmup(steps: Dict[str, Callable[[], None]], attempts: int = 3, retry_delay: float = 5.0):
+    """
+    Run warm-up steps in order, retrying failed ones with backoff. The process is
+    marked ready only once every step has succeeded; otherwise it stays degraded
+    until a lazy load of the failed subsystem succeeds (see step_recovered).
+    """
+    global _warmup_running
+    pending = dict(steps)
+    for attempt in range(1, attempts + 1):
+        for name, step in list(pending.items()):
+            try:
+                with timed("warm-up", name if attempt == 1 else f"{name} (retry {attempt - 1})"):
+                    step()
+            except Exception as e:
+                with _state_lock:
+                    _warmup_errors[name] = str(e)
+                print(f"⚠️  Warm-up step '{name}' failed (attempt {attempt}/{attempts}): {e}")
+                continue
+            del pending[name]
+            with _state_lock:
+                _warmup_errors.pop(name, None)
+        if not pending:
+            break
+        if attempt < attempts:
+            time.sleep(retry_delay * attempt)
+    print_breakdown("warm-up")
+
+    with _state_lock:
+        _warmup_running = False
+        if not _warmup_errors:
+            _ready.set()
+    if pending:
+        print(f"❌ Warm-up degraded - not ready until these load: {', '.join(pending)}")
+
+def step_recovered(name: str):
+    """A subsystem whose warm-up failed has since loaded lazily - flip ready if nothing else is failing"""
+    with _state_lock:
+        if _warmup_errors.pop(name, None) is None:
+            return
+        if not _warmup_errors and not _warmup_running:
+            _ready.set()
+            print(f"✅ '{name}' loaded after warm-up failure - ready to serve traffic")
+
+def mark_ready():
+    _ready.set()
+
+def is_ready() -> bool:
+    return _ready.is_set()
+
+def readiness_status() -> dict:
+    """Summary of warm-up progress for the readiness probe"""
+    with _state_lock:
+        errors = dict(_warmup_errors)
+        running = _warmup_running
+    if is_ready():
+        state = "ready"
+    elif running:
+        state = "warming_up"
+    else:
+        state = "degraded"
+    return {
+        "ready": is_ready(),
+        "state": state,
+        "warmup": {name: round(secs, 3) for phase, name, secs in STARTUP_TIMINGS if phase == "warm-up"},
+        "errors": errors,
+    }